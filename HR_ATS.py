@@ -1,9 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, simpledialog, filedialog
 import sqlite3
+import threading
+import queue
+import time
 import datetime
 import csv
+import re
+import itertools
+import contextlib
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 from reportlab.lib.pagesizes import LETTER
 from reportlab.pdfgen import canvas
@@ -12,12 +19,33 @@ from reportlab.pdfgen import canvas
 # CONFIG
 # =========================
 DB_FILE = "hr_ats.db"
+SCHEMA_VERSION = 3                # bump when migrate/create_tables/seed change
+
+BULK_INSERT_CHUNK = 128          # rows per multi-row INSERT statement
+INDEX_REBUILD_THRESHOLD = 5_000   # bulk imports above this drop/rebuild applicant indexes
+HISTORY_BATCH_SIZE = 500          # max history rows per background write
+HISTORY_FLUSH_INTERVAL = 0.5      # seconds the history writer waits to fill a batch
+
+APPLICANT_INDEXES = {
+    "idx_applicants_applied":   "applicants(applied_date DESC)",
+    "idx_applicants_interview": "applicants(interview_date)",
+    "idx_applicants_status":    "applicants(status)",
+}
 
 STAGES = [
     "Applied", "Screening", "Interview", "Background Check",
     "Offer", "Hired", "Rejected"
 ]
 
+# Offer letter layout: (y, text); {name}, {job} and {date} are filled per candidate
+OFFER_LAYOUT = (
+    (750, "Offer of Employment"),
+    (710, "Dear {name},"),
+    (670, "We are pleased to offer you the {job} position."),
+    (630, "We look forward to working with you!"),
+    (590, "Date: {date}"),
+)
+
 JOB_BOARDS = [
     {"name": "Indeed",       "key_prefix": "indeed",     "needs_api_key": True,  "needs_oauth": False},
     {"name": "ZipRecruiter", "key_prefix": "ziprecruiter", "needs_api_key": True,  "needs_oauth": False},
@@ -29,12 +57,56 @@ JOB_BOARDS = [
 # DATABASE
 # =========================
 class Database:
+    # Hot statements live here so every caller passes the exact same SQL text:
+    # sqlite3 caches prepared statements keyed by that text, so reusing these
+    # skips the parse/plan step. Per-row callers should add theirs here too.
+    SQL_ADD_APPLICANT = ("INSERT INTO applicants "
+                         "(name, email, phone, job, status, applied_date, source, notes) "
+                         "VALUES (?,?,?,?,?,?,?,?)")
+    # Skips entries whose applicant was deleted before the queued write landed
+    SQL_INSERT_HISTORY = ("INSERT INTO history (applicant_id, date, change) "
+                          "SELECT ?1, ?2, ?3 WHERE EXISTS (SELECT 1 FROM applicants WHERE id = ?1)")
+
     def __init__(self):
-        self.conn = sqlite3.connect(DB_FILE)
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        self.migrate()
-        self.create_tables()
-        self.seed()
+        # One shared writer connection (serialized by self.lock) plus one
+        # autocommit reader connection per thread; WAL lets readers proceed
+        # while a write transaction is open.
+        self.conn = self._connect(check_same_thread=False)
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        """)
+        self.conn.commit()
+
+        # Schema already current: skip the PRAGMA probes and seed check
+        if self.get_setting("schema_version") != str(SCHEMA_VERSION):
+            self.migrate()
+            self.create_tables()
+            self.seed()
+            self.set_setting("schema_version", SCHEMA_VERSION)
+
+    def _connect(self, **kwargs):
+        conn = sqlite3.connect(DB_FILE, cached_statements=256, **kwargs)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = -20000")      # ~20 MB
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")    # 256 MB
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def cursor(self):
+        """Cursor on the calling thread's reader connection. Use write()/bulk() to modify data."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect(isolation_level=None)
+        return conn.cursor()
 
     def migrate(self):
         c = self.conn.cursor()
@@ -52,8 +124,9 @@ class Database:
             ("source", "TEXT DEFAULT 'Manual'"),   # ← this was missing
         ]
 
+        # (a brand-new database has no applicants table yet; create_tables builds it)
         for col_name, col_type in migrations:
-            if col_name not in cols:
+            if cols and col_name not in cols:
                 try:
                     c.execute(f"ALTER TABLE applicants ADD COLUMN {col_name} {col_type}")
                     print(f"Added column: {col_name}")
@@ -61,7 +134,7 @@ class Database:
                     print(f"Could not add column {col_name}: {e}")
 
         # If source was just added, set default value for old rows
-        if "source" not in cols:
+        if cols and "source" not in cols:
             c.execute("UPDATE applicants SET source = 'Manual' WHERE source IS NULL")
 
         # ── email_templates migration ───────────────────────────────────────
@@ -71,14 +144,6 @@ class Database:
             c.execute("ALTER TABLE email_templates ADD COLUMN name TEXT")
             c.execute("UPDATE email_templates SET name = 'Template ' || id WHERE name IS NULL OR name = ''")
 
-        # ── settings table ──────────────────────────────────────────────────
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        )
-        """)
-
         self.conn.commit()
 
     def create_tables(self):
@@ -107,6 +172,8 @@ class Database:
             FOREIGN KEY(applicant_id) REFERENCES applicants(id) ON DELETE CASCADE
         )
         """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_history_applicant ON history(applicant_id)")
+        self.create_indexes(c)
         c.execute("""
         CREATE TABLE IF NOT EXISTS email_templates (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -117,30 +184,77 @@ class Database:
         """)
         self.conn.commit()
 
+    def create_indexes(self, c=None):
+        c = c or self.conn.cursor()
+        for name, target in APPLICANT_INDEXES.items():
+            c.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+    def drop_indexes(self, c=None):
+        c = c or self.conn.cursor()
+        for name in APPLICANT_INDEXES:
+            c.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def bulk_insert(self, table, cols, rows, chunk=BULK_INSERT_CHUNK, c=None):
+        """INSERT OR IGNORE rows using multi-row VALUES statements. Returns rows added."""
+        c = c or self.conn.cursor()
+        chunk = max(1, min(chunk, 999 // len(cols)))   # stay under SQLite's bound-parameter limit
+        head = f"INSERT OR IGNORE INTO {table} ({', '.join(cols)}) VALUES "
+        one = "(" + ",".join("?" * len(cols)) + ")"
+        many = head + ",".join([one] * chunk)
+
+        rows = list(rows)
+        full = len(rows) - len(rows) % chunk
+        before = c.connection.total_changes
+        for i in range(0, full, chunk):
+            c.execute(many, list(itertools.chain.from_iterable(rows[i:i + chunk])))
+        if full < len(rows):
+            c.executemany(head + one, rows[full:])
+        return c.connection.total_changes - before
+
+    @contextlib.contextmanager
+    def write(self):
+        """Run a block of writes on the writer connection (commit on success, rollback on error)."""
+        with self.lock:
+            try:
+                yield self.conn.cursor()
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """Like write(), but takes the database write lock up front with BEGIN IMMEDIATE."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn.cursor()
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
     def seed(self):
-        c = self.conn.cursor()
-        if c.execute("SELECT COUNT(*) FROM email_templates").fetchone()[0] == 0:
-            c.executemany("""
-                INSERT INTO email_templates (name, subject, body) VALUES (?,?,?)
-            """, [
+        if self.conn.execute("SELECT COUNT(*) FROM email_templates").fetchone()[0] > 0:
+            return
+        with self.bulk() as c:
+            self.bulk_insert("email_templates", ("name", "subject", "body"), [
                 ("Interview Invite", "Interview Invitation – {job}",
                  "Hi {name},\n\nWe would like to invite you to interview for the {job} position.\n\nBest regards,\nHR Team"),
                 ("Offer Sent", "Job Offer – {job}",
                  "Dear {name},\n\nCongratulations! We are pleased to offer you the {job} position.\n\nHR Team"),
                 ("Rejection", "Application Update",
                  "Dear {name},\n\nThank you for your interest in the {job} position.\n\nWe have decided to move forward with other candidates.\n\nBest wishes,\nHR Team")
-            ])
-        self.conn.commit()
+            ], c=c)
 
     def get_setting(self, key, default=None):
-        c = self.conn.cursor()
+        c = self.cursor()
         row = c.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
         return row[0] if row else default
 
     def set_setting(self, key, value):
-        c = self.conn.cursor()
-        c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?,?)", (key, str(value)))
-        self.conn.commit()
+        with self.write() as c:
+            c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?,?)", (key, str(value)))
 
 
 db = Database()
@@ -150,12 +264,38 @@ db = Database()
 # MAIN APPLICATION
 # =========================
 class HRApp:
+    _PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
     def __init__(self, root):
         self.root = root
         root.title("HR ATS")
         root.geometry("1280x820")
         root.minsize(1100, 700)
 
+        # Dashboard aggregates, reused until the applicants table changes
+        self._dash_cache = {}
+        self._dash_token = None
+        self._stage_order = {s: i for i, s in enumerate(STAGES)}
+
+        # Applicant rows as last rendered in the tree: iid -> values
+        self._tree_row_cache = {}
+
+        # Set while a coalesced refresh_all is waiting on the Tk event loop
+        self._refresh_pending = False
+
+        # (name, subject, body, subject_fn, body_fn) per email template; None until loaded
+        self._templates = None
+
+        # Slow I/O (PDF writing, launching the mail client) runs off the Tk thread
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        self._jobs = []   # (future, on_done) pairs polled from the Tk thread
+
+        # History rows are queued by the UI and written in batches by a background thread
+        self._history_queue = queue.Queue()
+        self._history_thread = threading.Thread(target=self._history_writer, daemon=True)
+        self._history_thread.start()
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.style_ui()
         self.build_ui()
         self.refresh_all()
@@ -182,10 +322,28 @@ class HRApp:
         self.nb.add(self.tab_templates,   text="Email Templates")
         self.nb.add(self.tab_settings,    text="Settings")
 
-        self.build_dashboard()
-        self.build_applicants_tab()
-        self.build_templates_tab()
-        self.build_settings_tab()
+        # Tabs are built the first time they are shown and refreshed only while visible
+        self._tabs = {
+            str(self.tab_dashboard):  (self.build_dashboard,      self.refresh_dashboard),
+            str(self.tab_applicants): (self.build_applicants_tab, self.refresh_applicants),
+            str(self.tab_templates):  (self.build_templates_tab,  self.refresh_templates),
+            str(self.tab_settings):   (self.build_settings_tab,   None),
+        }
+        self._built = set()
+        self._stale = set()
+        self.nb.bind("<<NotebookTabChanged>>", self._on_tab)
+
+    def _on_tab(self, evt=None):
+        tab = self.nb.select()
+        build, refresh = self._tabs[tab]
+        if tab not in self._built:
+            build()
+            self._built.add(tab)
+            self._stale.add(tab)
+        if tab in self._stale:
+            self._stale.discard(tab)
+            if refresh:
+                refresh()
 
     # ────────────────────────────────────────────────
     #  DASHBOARD
@@ -222,44 +380,83 @@ class HRApp:
         self.recent_tree.pack(fill="both", expand=True)
 
     def refresh_dashboard(self):
-        c = db.conn.cursor()
+        c = db.cursor()
         today = datetime.date.today()
 
-        total = c.execute("SELECT COUNT(*) FROM applicants").fetchone()[0]
-        self.lbl_total.config(text=f"Total Applicants: {total}")
+        token = (today,) + tuple(c.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM applicants").fetchone())
+        if token != self._dash_token:
+            self._dash_cache = self._load_dashboard(c, today)
+            self._dash_token = token
+        data = self._dash_cache
 
-        status_data = c.execute("SELECT status, COUNT(*) FROM applicants GROUP BY status").fetchall()
-        status_str = "  •  ".join(f"{k}: {v}" for k,v in status_data if k)
-        self.lbl_status.config(text=f"Statuses: {status_str or '—'}")
-
-        next7 = today + datetime.timedelta(days=7)
-        rows = c.execute("""
-            SELECT name, job, interview_date FROM applicants
-            WHERE interview_date >= ? AND interview_date <= ?
-            ORDER BY interview_date
-        """, (str(today), str(next7))).fetchall()
+        self.lbl_total.config(text=f"Total Applicants: {data['total']}")
+        self.lbl_status.config(text=f"Statuses: {data['status_str'] or '—'}")
 
         self.upcoming_text.config(state="normal")
         self.upcoming_text.delete("1.0", tk.END)
-        if not rows:
+        if not data["upcoming_rows"]:
             self.upcoming_text.insert("end", "No upcoming interviews.\n")
         else:
-            for n, j, d in rows:
-                self.upcoming_text.insert("end", f"{d}   {n}  ({j})\n")
+            # One insert -> one layout pass
+            self.upcoming_text.insert("end", "\n".join(f"{d}   {n}  ({j})" for n, j, d in data["upcoming_rows"]) + "\n")
         self.upcoming_text.config(state="disabled")
 
+        # Hide the columns while repopulating so the tree redraws once
+        self.recent_tree.configure(displaycolumns=())
+        self.recent_tree.delete(*self.recent_tree.get_children())
+        for n, j, src, d in data["recent_rows"]:
+            self.recent_tree.insert("", "end", values=(n, j, src or "Manual", d))
+        self.recent_tree.configure(displaycolumns="#all")
+
+    def _load_dashboard(self, c, today):
+        next7 = today + datetime.timedelta(days=7)
         last7 = today - datetime.timedelta(days=7)
-        for item in self.recent_tree.get_children():
-            self.recent_tree.delete(item)
 
+        # One round-trip; the first column says which section a row belongs to
         c.execute("""
-            SELECT name, job, source, applied_date FROM applicants
-            WHERE applied_date >= ?
-            ORDER BY applied_date DESC LIMIT 12
-        """, (str(last7),))
+            SELECT 'status', COUNT(*), status, NULL, NULL, NULL
+            FROM applicants GROUP BY status
+            UNION ALL
+            SELECT 'upcoming', 0, name, job, NULL, interview_date
+            FROM applicants WHERE interview_date BETWEEN ? AND ?
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'recent', 0, name, job, source, applied_date
+                FROM applicants WHERE applied_date >= ?
+                ORDER BY applied_date DESC LIMIT 12
+            )
+        """, (str(today), str(next7), str(last7)))
+
+        status_data, upcoming_rows, recent_rows = [], [], []
+        for kind, count, name, job, src, d in c.fetchall():
+            if kind == "status":
+                status_data.append((name, count))
+            elif kind == "upcoming":
+                upcoming_rows.append((name, job, d))
+            else:
+                recent_rows.append((name, job, src, d))
+        upcoming_rows.sort(key=lambda r: r[2])
+        recent_rows.sort(key=lambda r: r[3], reverse=True)
+
+        total = sum(n for _, n in status_data)   # GROUP BY status covers every row
+        # Pipeline order first, then any statuses outside STAGES
+        parts = [None] * len(STAGES)
+        for k, v in status_data:
+            if not k:
+                continue
+            idx = self._stage_order.get(k)
+            if idx is None:
+                parts.append(f"{k}: {v}")
+            else:
+                parts[idx] = f"{k}: {v}"
+        status_str = "  •  ".join(p for p in parts if p)
 
-        for n, j, src, d in c.fetchall():
-            self.recent_tree.insert("", "end", values=(n, j, src or "Manual", d))
+        return {
+            "total": total,
+            "status_str": status_str,
+            "upcoming_rows": upcoming_rows,
+            "recent_rows": recent_rows,
+        }
 
     # ────────────────────────────────────────────────
     #  APPLICANTS TAB
@@ -288,17 +485,38 @@ class HRApp:
         ttk.Button(btns, text="🗑️ Delete", command=self.delete_applicant).pack(side="right", padx=4)
 
     def refresh_applicants(self):
-        self.tree.delete(*self.tree.get_children())
-        c = db.conn.cursor()
+        c = db.cursor()
+        c.arraysize = 256
         c.execute("""
             SELECT id, name, email, job, status, source, interview_date 
             FROM applicants 
             ORDER BY applied_date DESC
         """)
-        for row in c.fetchall():
-            values = list(row[1:])
-            values[4] = values[4] or "Manual"  # source
-            self.tree.insert("", "end", iid=row[0], values=values)
+        new = {}
+        while batch := c.fetchmany():
+            for r in batch:
+                new[str(r["id"])] = (r["name"], r["email"], r["job"], r["status"],
+                                     r["source"] or "Manual", r["interview_date"])
+
+        # Only touch the rows that actually changed
+        old = self._tree_row_cache
+        gone = old.keys() - new.keys()
+        if gone:
+            self.tree.delete(*gone)
+        # Mirror the tree's row order locally so positions never need a Tk query
+        order = [i for i in old if i not in gone]
+        for index, (iid, values) in enumerate(new.items()):
+            if iid not in old:
+                self.tree.insert("", index, iid=iid, values=values)
+                order.insert(index, iid)
+                continue
+            if old[iid] != values:
+                self.tree.item(iid, values=values)
+            if order[index] != iid:
+                self.tree.move(iid, "", index)
+                order.remove(iid)
+                order.insert(index, iid)
+        self._tree_row_cache = new
 
     def add_applicant(self):
         win = tk.Toplevel(self.root)
@@ -325,25 +543,21 @@ class HRApp:
             applied = fields.get("Applied Date", "").get().strip() or str(datetime.date.today())
             source = fields.get("Source", "").get().strip() or "Manual"
 
-            c = db.conn.cursor()
-            c.execute("""
-                INSERT INTO applicants (name, email, phone, job, status, applied_date, source, notes)
-                VALUES (?,?,?,?,?,?,?,?)
-            """, (
-                name, email,
-                fields["Phone"].get().strip(),
-                fields["Job"].get().strip(),
-                "Applied",
-                applied,
-                source,
-                fields["Notes"].get("1.0", tk.END).strip() if "Notes" in fields else ""
-            ))
-            app_id = c.lastrowid
-            c.execute("INSERT INTO history (applicant_id, date, change) VALUES (?,?,?)",
-                      (app_id, str(datetime.date.today()), "Added manually"))
-            db.conn.commit()
+            with db.write() as c:
+                c.execute(db.SQL_ADD_APPLICANT, (
+                    name, email,
+                    fields["Phone"].get().strip(),
+                    fields["Job"].get().strip(),
+                    "Applied",
+                    applied,
+                    source,
+                    fields["Notes"].get("1.0", tk.END).strip() if "Notes" in fields else ""
+                ))
+                app_id = c.lastrowid
+            self._history_queue.put((app_id, str(datetime.date.today()), "Added manually"))
+            self._dash_token = None
             win.destroy()
-            self.refresh_all()
+            self._schedule_refresh()
 
         ttk.Button(win, text="Save", command=save).grid(row=7, column=0, columnspan=2, pady=20)
 
@@ -357,8 +571,8 @@ class HRApp:
 
         try:
             with open(file, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = [h.lower() for h in (reader.fieldnames or [])]
+                reader = csv.reader(f)
+                fieldnames = [h.lower() for h in next(reader, [])]
 
                 name_idx  = next((i for i, h in enumerate(fieldnames) if "name" in h), None)
                 email_idx = next((i for i, h in enumerate(fieldnames) if "email" in h), None)
@@ -366,35 +580,43 @@ class HRApp:
                 job_idx   = next((i for i, h in enumerate(fieldnames) if "job" in h or "title" in h), None)
                 date_idx  = next((i for i, h in enumerate(fieldnames) if "date" in h or "applied" in h), None)
 
-                c = db.conn.cursor()
-                added = 0
+                def field(row, idx, default=""):
+                    return row[idx] if idx is not None and idx < len(row) else default
 
+                today = str(datetime.date.today())
+                rows = []
                 for row in reader:
-                    values = list(row.values())
-                    name  = (values[name_idx] if name_idx is not None else "").strip()
-                    email = (values[email_idx] if email_idx is not None else "").strip()
+                    name  = field(row, name_idx).strip()
+                    email = field(row, email_idx).strip()
                     if not name or not email:
                         continue
 
-                    c.execute("""
-                        INSERT OR IGNORE INTO applicants
-                        (name, email, phone, job, status, applied_date, source)
-                        VALUES (?,?,?,?,?,?,?)
-                    """, (
+                    rows.append((
                         name,
                         email,
-                        values[phone_idx] if phone_idx is not None else "",
-                        values[job_idx] if job_idx is not None else "",
+                        field(row, phone_idx),
+                        field(row, job_idx),
                         "Applied",
-                        values[date_idx] if date_idx is not None else str(datetime.date.today()),
+                        field(row, date_idx, today),
                         "CSV Import"
                     ))
-                    if c.rowcount > 0:
-                        added += 1
 
-                db.conn.commit()
+                # One transaction, multi-row INSERTs
+                rebuild = len(rows) > INDEX_REBUILD_THRESHOLD
+                with db.bulk() as c:
+                    if rebuild:
+                        db.drop_indexes(c)   # cheaper to index once after the load
+                    added = db.bulk_insert(
+                        "applicants",
+                        ("name", "email", "phone", "job", "status", "applied_date", "source"),
+                        rows, c=c
+                    )
+                    if rebuild:
+                        db.create_indexes(c)   # same transaction, so the indexes can't be lost
+                self._dash_token = None
+
                 messagebox.showinfo("Import Complete", f"Imported {added} new applicants.\n(duplicates skipped)")
-                self.refresh_all()
+                self._schedule_refresh()
 
         except Exception as e:
             messagebox.showerror("Import Error", f"Failed to import CSV:\n{str(e)}")
@@ -413,10 +635,10 @@ class HRApp:
             return
         if not messagebox.askyesno("Delete", "Delete selected applicant?"):
             return
-        c = db.conn.cursor()
-        c.execute("DELETE FROM applicants WHERE id=?", (sel[0],))
-        db.conn.commit()
-        self.refresh_all()
+        with db.write() as c:
+            c.execute("DELETE FROM applicants WHERE id=?", (sel[0],))
+        self._dash_token = None
+        self._schedule_refresh()
 
     def update_status(self):
         sel = self.tree.selection()
@@ -431,13 +653,12 @@ class HRApp:
 
         def save():
             status = combo.get()
-            c = db.conn.cursor()
-            c.execute("UPDATE applicants SET status=? WHERE id=?", (status, app_id))
-            c.execute("INSERT INTO history (applicant_id, date, change) VALUES (?,?,?)",
-                      (app_id, str(datetime.date.today()), f"Status → {status}"))
-            db.conn.commit()
+            with db.write() as c:
+                c.execute("UPDATE applicants SET status=? WHERE id=?", (status, app_id))
+            self._history_queue.put((app_id, str(datetime.date.today()), f"Status → {status}"))
+            self._dash_token = None
             win.destroy()
-            self.refresh_all()
+            self._schedule_refresh()
 
         ttk.Button(win, text="Update", command=save).pack(pady=10)
 
@@ -449,12 +670,11 @@ class HRApp:
         date = simpledialog.askstring("Interview Date", "YYYY-MM-DD", parent=self.root)
         if not date: return
 
-        c = db.conn.cursor()
-        c.execute("UPDATE applicants SET interview_date=? WHERE id=?", (date.strip(), app_id))
-        c.execute("INSERT INTO history (applicant_id, date, change) VALUES (?,?,?)",
-                  (app_id, str(datetime.date.today()), f"Interview: {date}"))
-        db.conn.commit()
-        self.refresh_all()
+        with db.write() as c:
+            c.execute("UPDATE applicants SET interview_date=? WHERE id=?", (date.strip(), app_id))
+        self._history_queue.put((app_id, str(datetime.date.today()), f"Interview: {date}"))
+        self._dash_token = None
+        self._schedule_refresh()
 
     def send_email(self):
         sel = self.tree.selection()
@@ -463,7 +683,7 @@ class HRApp:
             return
 
         app_id = sel[0]
-        c = db.conn.cursor()
+        c = db.cursor()
         c.execute("SELECT name, email, job FROM applicants WHERE id=?", (app_id,))
         name, email, job = c.fetchone() or (None, None, None)
 
@@ -471,8 +691,7 @@ class HRApp:
             messagebox.showwarning("No Email", "Applicant has no email address.")
             return
 
-        c.execute("SELECT name, subject, body FROM email_templates ORDER BY name")
-        templates = c.fetchall()
+        templates = self._get_templates()
 
         if not templates:
             messagebox.showinfo("No Templates", "No email templates found.")
@@ -491,21 +710,42 @@ class HRApp:
         def send():
             idx = lb.curselection()
             if not idx: return
-            subj = templates[idx[0]][1].replace("{name}", name or "").replace("{job}", job or "")
-            body = templates[idx[0]][2].replace("{name}", name or "").replace("{job}", job or "")
+            ctx = {"name": name or "", "job": job or "", "email": email or ""}
+            _, _, _, subject_fn, body_fn = templates[idx[0]]
+            subj = subject_fn(ctx)
+            body = body_fn(ctx)
 
             url = f"mailto:{email}?subject={quote(subj)}&body={quote(body)}"
-            webbrowser.open(url)
+            self._run_in_background(webbrowser.open, url, on_done=self._email_opened)
             win.destroy()
 
         ttk.Button(win, text="Send", command=send).pack(pady=15)
 
+    def _email_opened(self, future):
+        err = future.exception()
+        if err or not future.result():
+            messagebox.showerror("Email Error", f"Could not open the mail client:\n{err or 'no handler for mailto: links'}")
+
+    @classmethod
+    def _compile_template(cls, text):
+        """Split text once into literals and {field} names; the returned function just joins."""
+        parts = cls._PLACEHOLDER_RE.split(text or "")
+        literals, fields = parts[0::2], parts[1::2]
+
+        def render(ctx):
+            out = [literals[0]]
+            for field, literal in zip(fields, literals[1:]):
+                out.append(ctx.get(field, ""))
+                out.append(literal)
+            return "".join(out)
+        return render
+
     def generate_offer_pdf(self):
         sel = self.tree.selection()
         if not sel: return
         app_id = sel[0]
 
-        c = db.conn.cursor()
+        c = db.cursor()
         c.execute("SELECT name, job FROM applicants WHERE id=?", (app_id,))
         name, job = c.fetchone()
         if not name or not job:
@@ -513,15 +753,40 @@ class HRApp:
             return
 
         fname = f"Offer_{name.replace(' ','_')}_{datetime.date.today()}.pdf"
+        self._run_in_background(self._write_offer_pdf, fname, name, job,
+                                on_done=lambda fut: self._offer_pdf_done(fut, fname))
+
+    @staticmethod
+    def _write_offer_pdf(fname, name, job):
         pdf = canvas.Canvas(fname, pagesize=LETTER)
-        pdf.drawString(80, 750, "Offer of Employment")
-        pdf.drawString(80, 710, f"Dear {name},")
-        pdf.drawString(80, 670, f"We are pleased to offer you the {job} position.")
-        pdf.drawString(80, 630, "We look forward to working with you!")
-        pdf.drawString(80, 590, f"Date: {datetime.date.today()}")
+        date = datetime.date.today()
+        for y, text in OFFER_LAYOUT:
+            pdf.drawString(80, y, text.format(name=name, job=job, date=date))
         pdf.save()
 
-        messagebox.showinfo("PDF Created", f"Saved as:\n{fname}")
+    def _run_in_background(self, fn, *args, on_done):
+        # Workers never touch Tk; the Tk thread polls for finished jobs instead
+        self._jobs.append((self._pool.submit(fn, *args), on_done))
+        if len(self._jobs) == 1:
+            self.root.after(100, self._poll_jobs)
+
+    def _poll_jobs(self):
+        pending = []
+        for future, on_done in self._jobs:
+            if future.done():
+                on_done(future)
+            else:
+                pending.append((future, on_done))
+        self._jobs = pending
+        if pending:
+            self.root.after(100, self._poll_jobs)
+
+    def _offer_pdf_done(self, future, fname):
+        err = future.exception()
+        if err:
+            messagebox.showerror("PDF Error", f"Failed to create PDF:\n{err}")
+        else:
+            messagebox.showinfo("PDF Created", f"Saved as:\n{fname}")
 
     # ────────────────────────────────────────────────
     #  EMAIL TEMPLATES TAB
@@ -560,11 +825,19 @@ class HRApp:
 
         ttk.Button(right, text="💾 Save", command=self.save_template).pack(pady=16)
 
+    def _get_templates(self):
+        if self._templates is None:
+            c = db.cursor()
+            self._templates = [
+                (name, subject, body, self._compile_template(subject), self._compile_template(body))
+                for name, subject, body in c.execute("SELECT name, subject, body FROM email_templates ORDER BY name")
+            ]
+        return self._templates
+
     def refresh_templates(self):
         self.tpl_list.delete(0, tk.END)
-        c = db.conn.cursor()
-        for name, in c.execute("SELECT name FROM email_templates ORDER BY name"):
-            self.tpl_list.insert(tk.END, name)
+        for t in self._get_templates():
+            self.tpl_list.insert(tk.END, t[0])
 
     def on_template_select(self, evt):
         if not self.tpl_list.curselection():
@@ -574,8 +847,7 @@ class HRApp:
             return
 
         name = self.tpl_list.get(self.tpl_list.curselection())
-        c = db.conn.cursor()
-        row = c.execute("SELECT name, subject, body FROM email_templates WHERE name=?", (name,)).fetchone()
+        row = next((t for t in self._get_templates() if t[0] == name), None)
         if row:
             self.tpl_name.delete(0, tk.END)
             self.tpl_name.insert(0, row[0])
@@ -589,26 +861,27 @@ class HRApp:
         if not name: return
         name = name.strip()
         try:
-            c = db.conn.cursor()
-            c.execute("INSERT INTO email_templates (name, subject, body) VALUES (?,?,?)",
-                      (name, "Subject line...", "Dear {name},\n\n..."))
-            db.conn.commit()
-            self.refresh_templates()
-            idx = self.tpl_list.get(0, tk.END).index(name)
-            self.tpl_list.selection_set(idx)
-            self.tpl_list.see(idx)
-            self.on_template_select(None)
+            with db.write() as c:
+                c.execute("INSERT INTO email_templates (name, subject, body) VALUES (?,?,?)",
+                          (name, "Subject line...", "Dear {name},\n\n..."))
         except sqlite3.IntegrityError:
             messagebox.showerror("Error", "Name already exists.")
+            return
+        self._templates = None
+        self.refresh_templates()
+        idx = self.tpl_list.get(0, tk.END).index(name)
+        self.tpl_list.selection_set(idx)
+        self.tpl_list.see(idx)
+        self.on_template_select(None)
 
     def delete_template(self):
         if not self.tpl_list.curselection(): return
         name = self.tpl_list.get(self.tpl_list.curselection())
         if not messagebox.askyesno("Delete", f"Delete '{name}'?"): return
 
-        c = db.conn.cursor()
-        c.execute("DELETE FROM email_templates WHERE name=?", (name,))
-        db.conn.commit()
+        with db.write() as c:
+            c.execute("DELETE FROM email_templates WHERE name=?", (name,))
+        self._templates = None
         self.refresh_templates()
         self.tpl_name.delete(0, tk.END)
         self.tpl_subject.delete(0, tk.END)
@@ -620,7 +893,7 @@ class HRApp:
             messagebox.showwarning("Required", "Template name is required.")
             return
 
-        c = db.conn.cursor()
+        c = db.cursor()
         current = ""
         if self.tpl_list.curselection():
             current = self.tpl_list.get(self.tpl_list.curselection())
@@ -632,18 +905,19 @@ class HRApp:
 
         body = self.tpl_body.get("1.0", tk.END).rstrip()
 
-        if current:
-            c.execute("UPDATE email_templates SET name=?, subject=?, body=? WHERE name=?",
-                      (name, self.tpl_subject.get(), body, current))
-        else:
-            try:
-                c.execute("INSERT INTO email_templates (name, subject, body) VALUES (?,?,?)",
-                          (name, self.tpl_subject.get(), body))
-            except sqlite3.IntegrityError:
-                messagebox.showerror("Error", "Name already exists.")
-                return
+        try:
+            with db.write() as c:
+                if current:
+                    c.execute("UPDATE email_templates SET name=?, subject=?, body=? WHERE name=?",
+                              (name, self.tpl_subject.get(), body, current))
+                else:
+                    c.execute("INSERT INTO email_templates (name, subject, body) VALUES (?,?,?)",
+                              (name, self.tpl_subject.get(), body))
+        except sqlite3.IntegrityError:
+            messagebox.showerror("Error", "Name already exists.")
+            return
 
-        db.conn.commit()
+        self._templates = None
         self.refresh_templates()
         messagebox.showinfo("Saved", "Template saved.")
 
@@ -717,13 +991,56 @@ class HRApp:
         db.set_setting("default_status", self.default_status.get())
         messagebox.showinfo("Settings", "General settings saved.")
 
+    # ────────────────────────────────────────────────
+    #  HISTORY WRITER
+    # ────────────────────────────────────────────────
+    def _history_writer(self):
+        # Block for the first entry, then gather more until the batch is full
+        # or the flush interval runs out. A None entry means drain and stop.
+        stop = False
+        while not stop:
+            batch = [self._history_queue.get()]
+            deadline = time.monotonic() + HISTORY_FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < HISTORY_BATCH_SIZE:
+                try:
+                    batch.append(self._history_queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                stop = True
+                batch.pop()
+            if not batch:
+                continue
+            try:
+                with db.bulk() as c:
+                    c.executemany(db.SQL_INSERT_HISTORY, batch)
+            except sqlite3.Error as e:
+                print(f"Could not write {len(batch)} history entries: {e}")
+
+    def on_close(self):
+        self._history_queue.put(None)
+        self._history_thread.join()
+        # Let in-flight PDFs finish writing; safe to block since workers never call into Tk
+        self._pool.shutdown(wait=True)
+        self.root.destroy()
+
     # ────────────────────────────────────────────────
     #  REFRESH ALL
     # ────────────────────────────────────────────────
+    def _schedule_refresh(self):
+        # Rapid successive mutations collapse into a single refresh_all
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.root.after(50, self._flush_refresh)
+
+    def _flush_refresh(self):
+        self._refresh_pending = False
+        self.refresh_all()
+
     def refresh_all(self):
-        self.refresh_dashboard()
-        self.refresh_applicants()
-        self.refresh_templates()
+        # Mark every tab out of date; hidden ones catch up when next selected
+        self._stale.update(self._tabs)
+        self._on_tab()
 
 
 # =========================